@@ -1,4 +1,5 @@
 import os
+from pathlib import Path
 from dotenv import load_dotenv
 
 # Load .env from project root
@@ -8,5 +9,18 @@ NBA_API_BASE_URL = os.getenv("NBA_API_BASE_URL", "https://api.balldontlie.io/v1/
 NBA_API_KEY = os.getenv("NBA_API_KEY", "").strip()
 APP_TIMEZONE = os.getenv("APP_TIMEZONE", "America/Chicago")
 
-# Optional: sanity log (doesn't print the key)
-print(f"[CFG] env loaded. key_present={bool(NBA_API_KEY)} url={NBA_API_BASE_URL}")
+# responses at or above this many bytes get gzip/brotli when the client accepts it
+GZIP_MIN_SIZE = int(os.getenv("GZIP_MIN_SIZE", "1000"))
+
+# ledger/wallet live here; created by the app lifespan, not on import
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+DATA_DIR = Path(os.getenv("DATA_DIR", str(PROJECT_ROOT / "data")))
+
+# on startup, prefetch today's slate and the last N days before /health is ready (0 = off)
+WARMUP_DAYS = int(os.getenv("WARMUP_DAYS", "0"))
+
+# opt-in request profiling: profile when the header is sent, or for a random fraction of requests
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "").strip().lower() in ("1", "true", "yes")
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_HEADER = os.getenv("PROFILE_HEADER", "X-Profile")
+PROFILE_DIR = DATA_DIR / "profiles"
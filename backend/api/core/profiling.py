@@ -0,0 +1,152 @@
+import asyncio
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+def _collapse(frame) -> str:
+    stack = []
+    while frame is not None:
+        code = frame.f_code
+        stack.append(f"{code.co_name} ({Path(code.co_filename).name}:{frame.f_lineno})")
+        frame = frame.f_back
+    return ";".join(reversed(stack))
+
+
+class StackSampler:
+    """
+    Tiny sampling profiler: a background thread snapshots every thread's stack
+    at a fixed interval. Sampling all threads (not just the caller) matters
+    here because sync endpoints like /bets/settle run in the threadpool.
+
+    Threads still parked exactly where they were when profiling started (idle
+    pool workers, the server's own loops) are left out. Anything that moved
+    is kept, including time spent blocked on a lock, Event or future.
+    """
+
+    def __init__(self, interval: float = 0.001):
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._baseline: Dict[int, str] = {}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+
+    def _run(self):
+        me = threading.get_ident()
+        while True:
+            for ident, frame in sys._current_frames().items():
+                if ident == me:
+                    continue
+                stack = _collapse(frame)
+                if self._baseline.get(ident) == stack:
+                    continue
+                self.stacks[stack] += 1
+            self.samples += 1
+            if self._stop.wait(self.interval):
+                break
+
+    def start(self):
+        caller = threading.get_ident()
+        self._baseline = {
+            ident: _collapse(frame) for ident, frame in sys._current_frames().items() if ident != caller
+        }
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def report(self) -> str:
+        """Collapsed stacks (flamegraph.pl / speedscope format), hottest first."""
+        return "\n".join(f"{stack} {n}" for stack, n in self.stacks.most_common())
+
+
+class ProfilingMiddleware:
+    """
+    Profiles a single request when it carries `header` or wins the sampling
+    draw, then writes the stacks to `out_dir`. Only registered when profiling
+    is enabled, so normal deployments don't pay anything for it.
+    """
+
+    def __init__(self, app, out_dir: Path, sample_rate: float = 0.0,
+                 header: str = "x-profile", keep: int = 50):
+        self.app = app
+        self.out_dir = out_dir
+        self.sample_rate = sample_rate
+        self.header = header.lower().encode("latin-1")
+        self.keep = keep
+        self._busy = threading.Lock()  # samples cover all threads, so one profile at a time
+
+    def _wanted(self, scope) -> bool:
+        if any(k == self.header for k, _ in scope.get("headers", [])):
+            return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self._wanted(scope) or not self._busy.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+
+        status = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        sampler = StackSampler()
+        start = time.perf_counter()
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            sampler.stop()
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            self._busy.release()
+            await asyncio.to_thread(self._save, scope, status["code"], elapsed_ms, sampler)
+
+    def _save(self, scope, status: int, elapsed_ms: float, sampler: StackSampler):
+        route = getattr(scope.get("route"), "path", None) or scope.get("path", "")
+        slug = re.sub(r"[^A-Za-z0-9]+", "_", route).strip("_") or "root"
+        stamp = datetime.utcnow().strftime("%Y%m%dT%H%M%S%f")
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        path = self.out_dir / f"{stamp}-{slug}-{elapsed_ms:.0f}ms.txt"
+        header = (
+            f"# {scope.get('method', '')} {scope.get('path', '')}"
+            f"{'?' + scope['query_string'].decode() if scope.get('query_string') else ''}\n"
+            f"# route={route} status={status} elapsed_ms={elapsed_ms:.1f} samples={sampler.samples}\n"
+        )
+        path.write_text(header + sampler.report() + "\n", encoding="utf-8")
+
+        # retention: drop the oldest profiles beyond `keep`
+        for old in list_profiles(self.out_dir)[self.keep:]:
+            (self.out_dir / old["name"]).unlink(missing_ok=True)
+
+
+PROFILE_NAME_RE = re.compile(r"^(?P<stamp>\d{8}T\d{12})-(?P<route>.+)-(?P<ms>\d+)ms\.txt$")
+
+def list_profiles(out_dir: Path, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Saved profiles, newest first."""
+    if not out_dir.exists():
+        return []
+    items = []
+    for p in out_dir.glob("*.txt"):
+        m = PROFILE_NAME_RE.match(p.name)
+        if not m:
+            continue
+        items.append({
+            "name": p.name,
+            "created": datetime.strptime(m["stamp"], "%Y%m%dT%H%M%S%f").isoformat(),
+            "route": m["route"],
+            "elapsed_ms": int(m["ms"]),
+            "bytes": p.stat().st_size,
+        })
+    items.sort(key=lambda i: i["name"], reverse=True)
+    return items[:limit] if limit else items
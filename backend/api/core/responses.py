@@ -0,0 +1,147 @@
+import gzip
+import threading
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import GZipMiddleware, GZipResponder
+from typing import Any, Callable, Dict, Hashable, List, Tuple
+from .config import GZIP_MIN_SIZE
+
+# orjson is much faster than the stdlib encoder; fall back if it's missing
+try:
+    import orjson
+    from fastapi.responses import ORJSONResponse as DefaultResponse
+
+    def dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj)
+except ImportError:  # pragma: no cover
+    import json
+    DefaultResponse = JSONResponse
+
+    def dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+# brotli is optional: only offered when the package is installed
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+def _accepted_encodings(header: str) -> Dict[str, float]:
+    """Parse Accept-Encoding into {coding: q}, e.g. "gzip;q=0.5, br" -> {"gzip": 0.5, "br": 1.0}."""
+    accepted: Dict[str, float] = {}
+    for part in header.lower().split(","):
+        coding, *params = [p.strip() for p in part.split(";")]
+        if not coding:
+            continue
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[coding] = q
+    return accepted
+
+
+def _negotiate(accept_encoding: str, offered: List[str]) -> str:
+    accepted = _accepted_encodings(accept_encoding)
+    wildcard = accepted.get("*", 0.0)
+    # highest q wins; on a tie prefer the earlier (smaller) encoding. q=0 means "not acceptable"
+    best, best_q = "", 0.0
+    for coding in offered:
+        q = accepted.get(coding, wildcard)
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+def _pick_encoding(request: Request) -> str:
+    offered = ["br", "gzip"] if brotli is not None else ["gzip"]
+    return _negotiate(request.headers.get("accept-encoding", ""), offered)
+
+
+def _compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body)
+    return gzip.compress(body, compresslevel=6)
+
+
+class ByteCache:
+    """
+    Keeps the encoded (and compressed) JSON bytes of a payload, keyed by route
+    params. An entry is reused while its `version` is unchanged, so a repeat
+    request for the same cached data does no encoding work at all.
+    """
+
+    def __init__(self, maxsize: int = 128):
+        self.maxsize = maxsize
+        # key -> (version, {"": raw bytes, "gzip": ..., "br": ...})
+        self._store: Dict[Hashable, Tuple[Any, Dict[str, bytes]]] = {}
+        # sync endpoints (e.g. /bets/) share a cache across threadpool workers
+        self._lock = threading.Lock()
+
+    def _bodies(self, key: Hashable, version: Any, build: Callable[[], Any]) -> Dict[str, bytes]:
+        with self._lock:
+            hit = self._store.get(key)
+            # `==` on the same cached list is a cheap identity walk
+            if hit and hit[0] == version:
+                return hit[1]
+        bodies = {"": dumps(build())}
+        with self._lock:
+            if key not in self._store and len(self._store) >= self.maxsize:
+                self._store.pop(next(iter(self._store)), None)
+            self._store[key] = (version, bodies)
+        return bodies
+
+    def response(
+        self,
+        request: Request,
+        key: Hashable,
+        version: Any,
+        build: Callable[[], Any],
+    ) -> Response:
+        bodies = self._bodies(key, version, build)
+        raw = bodies[""]
+        encoding = _pick_encoding(request) if len(raw) >= GZIP_MIN_SIZE else ""
+        headers = {"Vary": "Accept-Encoding"}
+        if not encoding:
+            return Response(content=raw, media_type="application/json", headers=headers)
+        if encoding not in bodies:
+            # racing requests may both compress; the result is identical either way
+            bodies[encoding] = _compress(raw, encoding)
+        headers["Content-Encoding"] = encoding
+        return Response(content=bodies[encoding], media_type="application/json", headers=headers)
+
+    def clear(self):
+        with self._lock:
+            self._store.clear()
+
+
+class _SkipNegotiatedResponder(GZipResponder):
+    # ByteCache responses set Vary themselves; treat them like already-encoded ones
+    async def send_with_compression(self, message):
+        if message["type"] == "http.response.start":
+            vary = Headers(raw=message["headers"]).get("vary", "").lower()
+            await super().send_with_compression(message)
+            if "accept-encoding" in vary:
+                self.content_encoding_set = True
+            return
+        await super().send_with_compression(message)
+
+
+class NegotiatedGZipMiddleware(GZipMiddleware):
+    """
+    GZipMiddleware with the same Accept-Encoding rules as ByteCache (q-values,
+    exact tokens), and leaving ByteCache's already-negotiated responses alone.
+    """
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and _negotiate(Headers(scope=scope).get("accept-encoding", ""), ["gzip"]):
+            responder = _SkipNegotiatedResponder(self.app, self.minimum_size, compresslevel=self.compresslevel)
+            await responder(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
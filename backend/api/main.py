@@ -1,13 +1,71 @@
-from fastapi import FastAPI
-from .routers import games, results, bets
+import asyncio
+import threading
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Response
+from .core.config import (
+    GZIP_MIN_SIZE, NBA_API_BASE_URL, NBA_API_KEY, WARMUP_DAYS,
+    PROFILING_ENABLED, PROFILE_DIR, PROFILE_HEADER, PROFILE_SAMPLE_RATE,
+)
+from .core.profiling import ProfilingMiddleware
+from .core.responses import DefaultResponse, NegotiatedGZipMiddleware
+from .routers import games, results, bets, profiles
+from .services.nba_client import fetch_games_for_date, fetch_games_for_dates
 
 
-app = FastAPI(title="NBA Betting Simulator (Clean)")
+async def _warmup(days: int, stop: threading.Event):
+    """Prefetch what /games and /results?days=N ask for first, so those hit a warm cache."""
+    await fetch_games_for_date(games.today_local())
+    await fetch_games_for_dates(results.iso_days_ago(days), stop=stop)
+
+def _run_warmup(days: int, stop: threading.Event):
+    # the SDK calls are blocking, so warm up on a worker thread with its own loop
+    try:
+        asyncio.run(_warmup(days, stop))
+    except Exception as e:
+        print(f"[WARMUP] failed: {type(e).__name__}: {e}")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # sanity log (doesn't print the key)
+    print(f"[CFG] env loaded. key_present={bool(NBA_API_KEY)} url={NBA_API_BASE_URL}")
+    bets.ensure_storage()
+
+    warmup = None
+    stop = threading.Event()
+    if WARMUP_DAYS > 0:
+        app.state.ready = False
+        warmup = asyncio.create_task(asyncio.to_thread(_run_warmup, WARMUP_DAYS, stop))
+        warmup.add_done_callback(lambda _: setattr(app.state, "ready", True))
+    else:
+        app.state.ready = True
+
+    yield
+
+    # cancelling the task can't interrupt the worker thread; the stop flag makes it
+    # bail out after the batch in flight, so shutdown only waits for that one
+    if warmup and not warmup.done():
+        stop.set()
+        await warmup
+
+
+app = FastAPI(title="NBA Betting Simulator (Clean)", default_response_class=DefaultResponse, lifespan=lifespan)
+# compresses everything else; ByteCache responses are negotiated already and pass through
+app.add_middleware(NegotiatedGZipMiddleware, minimum_size=GZIP_MIN_SIZE)
+# only wired in when enabled, so unprofiled deployments have no extra layer at all
+if PROFILING_ENABLED:
+    app.add_middleware(
+        ProfilingMiddleware, out_dir=PROFILE_DIR, sample_rate=PROFILE_SAMPLE_RATE, header=PROFILE_HEADER,
+    )
 
 @app.get("/health")
-def health():
+def health(response: Response):
+    if not getattr(app.state, "ready", False):
+        response.status_code = 503
+        return {"status": "warming"}
     return {"status": "ok"}
 
 app.include_router(games.router)
 app.include_router(results.router)
-app.include_router(bets.router)
\ No newline at end of file
+app.include_router(bets.router)
+if PROFILING_ENABLED:
+    app.include_router(profiles.router)
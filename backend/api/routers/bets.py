@@ -1,37 +1,50 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request, Response
 from pydantic import BaseModel
-from typing import List, Dict, Any
-from pathlib import Path
+from typing import List, Dict, Any, Optional
 import csv
 import json
 from ..services.nba_client import fetch_games_for_date, fetch_games_for_dates
-from ..core.config import APP_TIMEZONE
+from ..services.bet_stats import BankrollStats
+from ..core.config import APP_TIMEZONE, DATA_DIR
+from ..core.responses import ByteCache
 from datetime import datetime, timedelta  # <-- add timedelta
 
 router = APIRouter(prefix="/bets", tags=["bets"])
 
-# DATA_DIR = Path("data")
-# DATA_DIR.mkdir(exist_ok=True)
-# LEDGER = DATA_DIR / "ledger.csv"
-# WALLET = DATA_DIR / "wallet.json"
-
-# always write under the repo root, no matter where uvicorn is launched from
-PROJECT_ROOT = Path(__file__).resolve().parents[3]
-DATA_DIR = PROJECT_ROOT / "data"
-DATA_DIR.mkdir(parents=True, exist_ok=True)
+# always write under the repo root (or DATA_DIR), no matter where uvicorn is launched from
 LEDGER = DATA_DIR / "ledger.csv"
 WALLET = DATA_DIR / "wallet.json"
 RESULTS_CSV = DATA_DIR / "results_last_3d.csv"
 
-# ensure ledger file exists with headers
-if not LEDGER.exists():
-    with LEDGER.open("w", newline="", encoding="utf-8") as f:
-        writer = csv.writer(f)
-        writer.writerow(["placed_at","bet_id","date","game_id","matchup","pick","stake","status","payout"])
+# settled_at orders settlements for the stats (see BankrollStats)
+LEDGER_HEADER = ["placed_at","bet_id","date","game_id","matchup","pick","stake","status","payout","settled_at"]
+
+# running analytics, updated on place/settle instead of rescanning the ledger
+STATS = BankrollStats(DATA_DIR / "stats.json", DATA_DIR / "equity.csv", LEDGER)
+
+# encoded /bets/ body, reused until the ledger file changes on disk
+_LEDGER_BYTES = ByteCache(maxsize=1)
 
-# ensure wallet exists
-if not WALLET.exists():
-    WALLET.write_text(json.dumps({"balance": 5000.0}))
+def ensure_storage():
+    """Create the data folder, ledger and wallet if missing. Called from the app lifespan."""
+    DATA_DIR.mkdir(parents=True, exist_ok=True)
+
+    # ensure ledger file exists with headers
+    if not LEDGER.exists():
+        write_ledger([])
+    else:
+        # older ledgers predate settled_at: rewrite them with the current header
+        with LEDGER.open("r", newline="", encoding="utf-8") as f:
+            header = next(csv.reader(f), [])
+        if header != LEDGER_HEADER:
+            write_ledger(read_ledger())
+
+    # ensure wallet exists
+    if not WALLET.exists():
+        WALLET.write_text(json.dumps({"balance": 5000.0}))
+
+    # load (or first-time build) the running stats before any bet touches them
+    STATS.load()
 
 def read_wallet() -> Dict[str,Any]:
     return json.loads(WALLET.read_text())
@@ -44,6 +57,14 @@ def append_ledger(row: List[Any]):
         writer = csv.writer(f)
         writer.writerow(row)
 
+def write_ledger(rows: List[Dict[str,Any]]):
+    # rewrite ledger safely (preserve header order)
+    with LEDGER.open("w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(LEDGER_HEADER)
+        for r in rows:
+            writer.writerow([r.get(col) or "" for col in LEDGER_HEADER])
+
 def read_ledger() -> List[Dict[str,Any]]:
     rows = []
     with LEDGER.open("r", newline="", encoding="utf-8") as f:
@@ -65,8 +86,25 @@ def get_wallet():
     return w
 
 @router.get("/")  # clearer than ""
-def list_bets():
-    return {"bets": read_ledger()}
+def list_bets(request: Request) -> Response:
+    st = LEDGER.stat()
+    version = (st.st_mtime_ns, st.st_size)
+    return _LEDGER_BYTES.response(request, "ledger", version, lambda: {"bets": read_ledger()})
+
+def _update_stats(update) -> Optional[str]:
+    """
+    Apply a stats update after the ledger/wallet are already written. If it
+    fails, resync from the ledger rather than failing the (done) bet operation.
+    """
+    try:
+        update()
+        return None
+    except Exception as e:
+        try:
+            STATS.rebuild()
+            return None
+        except Exception:
+            return f"{type(e).__name__}: {e}"
 
 @router.post("/")  # clearer than ""
 def place_bet(b: PlaceBet):
@@ -85,9 +123,23 @@ def place_bet(b: PlaceBet):
     bet_id = f"bet-{int(datetime.utcnow().timestamp()*1000)}"
     placed_at = datetime.utcnow().isoformat()
     # print("DEBUG place_bet writing to LEDGER =", LEDGER)
-    append_ledger([placed_at, bet_id, b.date, b.game_id, b.matchup, b.pick.upper(), stake, "open", ""])
+    append_ledger([placed_at, bet_id, b.date, b.game_id, b.matchup, b.pick.upper(), stake, "open", "", ""])
+    stats_error = _update_stats(lambda: STATS.record_bet(b.pick))
+
+    out = {"status":"ok", "balance": w["balance"], "bet_id": bet_id}
+    if stats_error:
+        out["stats_error"] = stats_error
+    return out
+
+@router.get("/stats")
+def get_stats():
+    """ROI, win rate, streaks, profit by team and equity curve from running aggregates."""
+    return STATS.summary()
 
-    return {"status":"ok", "balance": w["balance"], "bet_id": bet_id}
+@router.post("/stats/rebuild")
+def rebuild_stats():
+    """Recompute the aggregates from the full ledger (e.g. after editing it by hand)."""
+    return STATS.rebuild()
 
 @router.post("/settle")
 def settle_bets(days: int = 3):
@@ -99,6 +151,8 @@ def settle_bets(days: int = 3):
         ledger = read_ledger()            # list[dict] from CSV
         wallet = read_wallet()
         changed = 0
+        settled_at = datetime.utcnow().isoformat()
+        settled_rows: list[Dict[str, Any]] = []
 
         # load results from CSV
         if not RESULTS_CSV.exists():
@@ -174,30 +228,20 @@ def settle_bets(days: int = 3):
             else:
                 row["status"] = "lost"
                 row["payout"] = "0"
+            row["settled_at"] = settled_at
 
             changed += 1
+            settled_rows.append(row)
             new_rows.append(row)
 
-        # rewrite ledger safely (preserve header order)
-        with LEDGER.open("w", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f)
-            header = ["placed_at","bet_id","date","game_id","matchup","pick","stake","status","payout"]
-            writer.writerow(header)
-            for r in new_rows:
-                writer.writerow([
-                    r.get("placed_at",""),
-                    r.get("bet_id",""),
-                    r.get("date",""),
-                    r.get("game_id",""),
-                    r.get("matchup",""),
-                    r.get("pick",""),
-                    r.get("stake",""),
-                    r.get("status",""),
-                    r.get("payout",""),
-                ])
-
+        write_ledger(new_rows)
         write_wallet(wallet)
-        return {"settled": changed, "new_balance": wallet.get("balance", 0)}
+
+        out = {"settled": changed, "new_balance": wallet.get("balance", 0)}
+        stats_error = _update_stats(lambda: STATS.record_settled(settled_rows))
+        if stats_error:
+            out["stats_error"] = stats_error
+        return out
     except Exception as e:
         return {"settled": 0, "error": f"{type(e).__name__}: {e}"}
 
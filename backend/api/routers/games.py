@@ -1,12 +1,16 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request, Response
 from typing import Any, Dict, Optional, List
-from datetime import datetime
+from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
 from ..core.config import APP_TIMEZONE
-from ..services.nba_client import fetch_games_for_date
+from ..core.responses import ByteCache
+from ..services.nba_client import fetch_games_for_date, fetch_team_games
 
 router = APIRouter(prefix="/games", tags=["games"])
 
+# encoded bodies, reused while nba_client hands back the same cached games
+_GAMES_BYTES = ByteCache()
+
 def today_local() -> str:
     return datetime.now(ZoneInfo(APP_TIMEZONE)).strftime("%Y-%m-%d")
 
@@ -56,36 +60,74 @@ def simplify(g: Dict[str, Any], tz: str) -> Dict[str, Any]:
 
 @router.get("")
 async def get_games(
+    request: Request,
     date: Optional[str] = Query(None, description="YYYY-MM-DD in local time"),
     team: Optional[str] = Query(None, description="Filter by team abbreviation, e.g., LAL"),
     status: Optional[str] = Query(None, description="Scheduled | In Progress | Final"),
-) -> Dict[str, Any]:
+) -> Response:
     target = date or today_local()
     try:
         raw_games: List[Dict[str, Any]] = await fetch_games_for_date(target)
-        games = [simplify(g, APP_TIMEZONE) for g in raw_games]
 
-        if team:
-            t = team.upper()
-            games = [g for g in games if g["home"] == t or g["away"] == t]
-        if status:
-            s = status.lower()
-            games = [g for g in games if g["status"].lower() == s]
+        def build() -> Dict[str, Any]:
+            games = [simplify(g, APP_TIMEZONE) for g in raw_games]
+
+            if team:
+                t = team.upper()
+                games = [g for g in games if g["home"] == t or g["away"] == t]
+            if status:
+                s = status.lower()
+                games = [g for g in games if g["status"].lower() == s]
 
-        # Sort by tipoff text (best-effort)
-        def sort_key(g):
-            try:
-                return datetime.strptime(g["tipoff_local"].replace(" (Time TBD)", ""), "%Y-%m-%d %I:%M %p")
-            except Exception:
+            # Sort by tipoff text (best-effort)
+            def sort_key(g):
                 try:
-                    return datetime.strptime(g["tipoff_local"].replace(" (Time TBD)", ""), "%Y-%m-%d")
+                    return datetime.strptime(g["tipoff_local"].replace(" (Time TBD)", ""), "%Y-%m-%d %I:%M %p")
                 except Exception:
-                    return datetime.max
-        games.sort(key=sort_key)
+                    try:
+                        return datetime.strptime(g["tipoff_local"].replace(" (Time TBD)", ""), "%Y-%m-%d")
+                    except Exception:
+                        return datetime.max
+            games.sort(key=sort_key)
 
-        return {"date": target, "count": len(games), "games": games}
+            return {"date": target, "count": len(games), "games": games}
+
+        key = (target, (team or "").upper(), (status or "").lower())
+        return _GAMES_BYTES.response(request, key, raw_games, build)
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=502, detail=f"Fetch failed for {target}: {e}")
 
+# about a regular season; the index makes repeat reads cheap and misses are fetched off the loop
+MAX_RANGE_DAYS = 200
+
+@router.get("/range")
+async def get_team_range(
+    team: str = Query(..., description="Team abbreviation, e.g., LAL"),
+    start: Optional[str] = Query(None, alias="from", description="YYYY-MM-DD, defaults to 14 days ago"),
+    end: Optional[str] = Query(None, alias="to", description="YYYY-MM-DD, defaults to 14 days from today"),
+) -> Dict[str, Any]:
+    today = datetime.strptime(today_local(), "%Y-%m-%d").date()
+    try:
+        # parsed once; everything below uses the normalized dates (2025-1-1 -> 2025-01-01)
+        first = datetime.strptime(start, "%Y-%m-%d").date() if start else today - timedelta(days=14)
+        last = datetime.strptime(end, "%Y-%m-%d").date() if end else today + timedelta(days=14)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="from/to must be YYYY-MM-DD")
+    span = (last - first).days
+    if span < 0:
+        raise HTTPException(status_code=400, detail="from must be on or before to")
+    if span >= MAX_RANGE_DAYS:
+        raise HTTPException(status_code=400, detail=f"Range is limited to {MAX_RANGE_DAYS} days")
+    start, end = first.isoformat(), last.isoformat()
+
+    try:
+        raw_games = await fetch_team_games(team, first, last)
+        games = [simplify(g, APP_TIMEZONE) for g in raw_games]
+        games.sort(key=lambda g: g["raw_date"] or "")
+        return {"team": team.upper(), "from": start, "to": end, "count": len(games), "games": games}
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=502, detail=f"Fetch failed for {team} {start}..{end}: {e}")
@@ -0,0 +1,20 @@
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import FileResponse
+from typing import Any, Dict
+from ..core.config import PROFILE_DIR
+from ..core.profiling import list_profiles, PROFILE_NAME_RE
+
+router = APIRouter(prefix="/profiles", tags=["profiles"])
+
+@router.get("")
+def get_profiles(limit: int = Query(20, ge=1, le=200)) -> Dict[str, Any]:
+    items = list_profiles(PROFILE_DIR, limit)
+    return {"count": len(items), "profiles": items}
+
+@router.get("/{name}")
+def download_profile(name: str):
+    # only serve files the middleware could have written (no path tricks)
+    path = PROFILE_DIR / name
+    if not PROFILE_NAME_RE.match(name) or not path.exists():
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(path, media_type="text/plain", filename=name)
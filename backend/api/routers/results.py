@@ -1,12 +1,16 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request, Response
 from typing import Dict, Any, List
 from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
 from ..core.config import APP_TIMEZONE
+from ..core.responses import ByteCache
 from ..services.nba_client import fetch_games_for_dates
 
 router = APIRouter(prefix="/results", tags=["results"])
 
+# encoded bodies, reused while nba_client hands back the same cached games
+_RESULTS_BYTES = ByteCache()
+
 def iso_days_ago(n: int) -> List[str]:
     tz = ZoneInfo(APP_TIMEZONE)
     today = datetime.now(tz).date()
@@ -33,13 +37,17 @@ def simplify_game(g: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 @router.get("")
-async def get_results(days: int = Query(7, ge=1, le=30)) -> Dict[str, Any]:
+async def get_results(request: Request, days: int = Query(7, ge=1, le=30)) -> Response:
     try:
         dates = iso_days_ago(days)
         raw = await fetch_games_for_dates(dates)   # now returns list[dict]
-        finals = [simplify_game(g) for g in raw if (g.get("status") or "").lower() == "final"]
-        finals.sort(key=lambda g: g["date"], reverse=True)
-        return {"range_days": days, "count": len(finals), "games": finals}
+
+        def build() -> Dict[str, Any]:
+            finals = [simplify_game(g) for g in raw if (g.get("status") or "").lower() == "final"]
+            finals.sort(key=lambda g: g["date"], reverse=True)
+            return {"range_days": days, "count": len(finals), "games": finals}
+
+        return _RESULTS_BYTES.response(request, tuple(dates), raw, build)
     except Exception as e:
         raise HTTPException(status_code=502, detail=f"Failed to fetch results: {e}")
 
@@ -0,0 +1,229 @@
+import csv
+import io
+import json
+import os
+import threading
+import pandas as pd
+from pathlib import Path
+from typing import Any, Dict, Iterable, List
+
+EQUITY_HEADER = ["bet_id", "date", "profit"]
+
+
+def _empty() -> Dict[str, Any]:
+    return {
+        "bets": 0,
+        "open": 0,
+        "wins": 0,
+        "losses": 0,
+        "staked": 0.0,      # stakes of settled bets
+        "returned": 0.0,    # payouts of settled bets
+        "streak": {"type": "", "length": 0},
+        "longest_win": 0,
+        "longest_loss": 0,
+        "teams": {},        # pick -> {"bets", "wins", "losses", "profit"}
+    }
+
+def _team(state: Dict[str, Any], pick: str) -> Dict[str, Any]:
+    return state["teams"].setdefault(pick, {"bets": 0, "wins": 0, "losses": 0, "profit": 0.0})
+
+def _running_sum(values: pd.Series) -> float:
+    # left to right, like the `+=` in record_settled (.sum() is pairwise and can differ in the last bit)
+    return float(values.cumsum().iloc[-1]) if len(values) else 0.0
+
+def _write_atomic(path: Path, text: str):
+    tmp = path.with_name(path.name + ".tmp")
+    with tmp.open("w", encoding="utf-8", newline="") as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
+class BankrollStats:
+    """
+    Running bankroll aggregates, kept in memory and mirrored to disk next to
+    the wallet: the small counters in a JSON file, the equity curve in an
+    append-only CSV. place_bet/settle update them incrementally, so /bets/stats
+    never scans the ledger. `rebuild()` recomputes everything from the ledger.
+
+    Streaks and the equity curve follow settlement order: the ledger's
+    settled_at, then ledger order within one settle call. Both the running
+    updates and the rebuild use it, and both add money left to right in that
+    order, so a rebuild reproduces the running numbers exactly.
+
+    stats.json records the ledger's size and mtime as of the last update; if
+    the ledger changed behind our back (a crash mid-update, a hand edit) or the
+    files can't be read, load() rebuilds instead of trusting them.
+    """
+
+    def __init__(self, path: Path, equity_path: Path, ledger: Path):
+        self.path = path
+        self.equity_path = equity_path
+        self.ledger = ledger
+        self._state: Dict[str, Any] = {}
+        self._equity: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def _fingerprint(self) -> List[int]:
+        if not self.ledger.exists():
+            return []
+        st = self.ledger.stat()
+        return [st.st_mtime_ns, st.st_size]
+
+    def load(self) -> Dict[str, Any]:
+        """Read the stats files, or rebuild them from the ledger if missing or stale."""
+        if not self._state:
+            try:
+                state = json.loads(self.path.read_text())
+                with self.equity_path.open("r", newline="", encoding="utf-8") as f:
+                    equity = [
+                        {"bet_id": r["bet_id"], "date": r["date"], "profit": float(r["profit"])}
+                        for r in csv.DictReader(f)
+                    ]
+                fresh = state.get("ledger") == self._fingerprint()
+            except (OSError, ValueError, KeyError, TypeError):
+                fresh = False
+            if fresh:
+                self._state, self._equity = state, equity
+            else:
+                self._state, self._equity = self._from_ledger()
+                self._save(rewrite_equity=True)
+        return self._state
+
+    def _save(self, rewrite_equity: bool = False, new_points: Iterable[Dict[str, Any]] = ()):
+        # counters are O(teams); the equity curve is only ever appended to
+        self._state["ledger"] = self._fingerprint()
+        if rewrite_equity:
+            buf = io.StringIO(newline="")
+            writer = csv.DictWriter(buf, fieldnames=EQUITY_HEADER)
+            writer.writeheader()
+            writer.writerows(self._equity)
+            _write_atomic(self.equity_path, buf.getvalue())
+        elif new_points:
+            with self.equity_path.open("a", newline="", encoding="utf-8") as f:
+                csv.DictWriter(f, fieldnames=EQUITY_HEADER).writerows(new_points)
+        # written last: its fingerprint vouches for the ledger and equity.csv above
+        _write_atomic(self.path, json.dumps(self._state))
+
+    def record_bet(self, pick: str):
+        with self._lock:
+            s = self.load()
+            s["bets"] += 1
+            s["open"] += 1
+            _team(s, pick.upper())["bets"] += 1
+            self._save()
+
+    def record_settled(self, rows: Iterable[Dict[str, Any]]):
+        """Fold in ledger rows that were just settled (status won/lost)."""
+        with self._lock:
+            s = self.load()
+            profit = self._equity[-1]["profit"] if self._equity else 0.0
+            points = []
+            for r in rows:
+                won = r.get("status") == "won"
+                stake = float(r.get("stake") or 0)
+                payout = float(r.get("payout") or 0)
+                net = payout - stake
+
+                s["open"] -= 1
+                s["wins" if won else "losses"] += 1
+                s["staked"] += stake
+                s["returned"] += payout
+
+                streak = s["streak"]
+                kind = "won" if won else "lost"
+                if streak["type"] == kind:
+                    streak["length"] += 1
+                else:
+                    s["streak"] = streak = {"type": kind, "length": 1}
+                key = "longest_win" if won else "longest_loss"
+                s[key] = max(s[key], streak["length"])
+
+                t = _team(s, (r.get("pick") or "").upper())
+                t["wins" if won else "losses"] += 1
+                t["profit"] += net
+
+                profit += net
+                points.append({"bet_id": r.get("bet_id", ""), "date": r.get("date", ""), "profit": profit})
+            self._equity.extend(points)
+            self._save(new_points=points)
+
+    def rebuild(self) -> Dict[str, Any]:
+        with self._lock:
+            self._state, self._equity = self._from_ledger()
+            self._save(rewrite_equity=True)
+        return self.summary()
+
+    def _from_ledger(self):
+        """One vectorized pass over the ledger CSV -> (counters, equity curve)."""
+        s = _empty()
+        if not self.ledger.exists():
+            return s, []
+        df = pd.read_csv(self.ledger, dtype=str).fillna("")
+        if df.empty:
+            return s, []
+        if "settled_at" not in df:
+            df["settled_at"] = ""
+
+        df["pick"] = df["pick"].str.upper()
+        df["stake"] = pd.to_numeric(df["stake"], errors="coerce").fillna(0.0)
+        df["payout"] = pd.to_numeric(df["payout"], errors="coerce").fillna(0.0)
+        settled = df[df["status"].isin(["won", "lost"])].sort_values("settled_at", kind="stable")
+        settled = settled.assign(net=settled["payout"] - settled["stake"])
+
+        s["bets"] = len(df)
+        s["open"] = int((df["status"] == "open").sum())
+        s["wins"] = int((settled["status"] == "won").sum())
+        s["losses"] = int((settled["status"] == "lost").sum())
+        s["staked"] = _running_sum(settled["stake"])
+        s["returned"] = _running_sum(settled["payout"])
+
+        if not settled.empty:
+            # run lengths of consecutive identical outcomes
+            run_id = (settled["status"] != settled["status"].shift()).cumsum()
+            runs = settled.groupby(run_id)["status"].agg(["first", "size"])
+            s["streak"] = {"type": runs["first"].iloc[-1], "length": int(runs["size"].iloc[-1])}
+            longest = runs.groupby("first")["size"].max()
+            s["longest_win"] = int(longest.get("won", 0))
+            s["longest_loss"] = int(longest.get("lost", 0))
+
+        teams = df.groupby("pick").size().rename("bets").to_frame()
+        teams["wins"] = settled[settled["status"] == "won"].groupby("pick").size()
+        teams["losses"] = settled[settled["status"] == "lost"].groupby("pick").size()
+        teams["profit"] = settled.groupby("pick")["net"].agg(_running_sum)
+        teams = teams.fillna(0)
+        s["teams"] = {
+            pick: {"bets": int(t.bets), "wins": int(t.wins), "losses": int(t.losses), "profit": float(t.profit)}
+            for pick, t in teams.iterrows()
+        }
+
+        equity = settled.assign(profit=settled["net"].cumsum())[EQUITY_HEADER]
+        return s, equity.to_dict(orient="records")
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            s = self.load()
+            settled = s["wins"] + s["losses"]
+            profit = s["returned"] - s["staked"]
+            return {
+                "bets": s["bets"],
+                "open": s["open"],
+                "settled": settled,
+                "wins": s["wins"],
+                "losses": s["losses"],
+                "win_rate": s["wins"] / settled if settled else None,
+                "staked": s["staked"],
+                "profit": profit,
+                "roi": profit / s["staked"] if s["staked"] else None,
+                "current_streak": dict(s["streak"]),
+                "longest_win_streak": s["longest_win"],
+                "longest_loss_streak": s["longest_loss"],
+                "profit_by_team": {k: dict(v) for k, v in s["teams"].items()},
+                "equity_curve": list(self._equity),
+            }
+
+
+if __name__ == "__main__":
+    # python -m backend.api.services.bet_stats  -> rebuild stats.json from the ledger
+    from ..routers.bets import STATS, ensure_storage
+    ensure_storage()
+    print(json.dumps(STATS.rebuild(), indent=2))
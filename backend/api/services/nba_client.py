@@ -1,15 +1,34 @@
+import asyncio
 from balldontlie import BalldontlieAPI
 from fastapi import HTTPException
-from typing import Any, Dict, List, Tuple
-from ..core.config import NBA_API_KEY
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from ..core.config import APP_TIMEZONE, NBA_API_KEY
+import threading
 import time
+from datetime import date, datetime, timedelta
+from zoneinfo import ZoneInfo
 
 # caches
 _CACHE_SINGLE: Dict[str, Tuple[float, List[Dict[str, Any]]]] = {}
 _CACHE_MULTI: Dict[str, Tuple[float, List[Dict[str, Any]]]] = {}
 CACHE_TTL = 300  # 5 minutes
 
-api = BalldontlieAPI(api_key=NBA_API_KEY)
+# cross-date schedule index, filled as games are fetched
+_GAMES_BY_ID: Dict[int, Dict[str, Any]] = {}
+_TEAM_INDEX: Dict[str, Dict[int, str]] = {}       # team abbr -> {game_id: date}
+_DATE_GAMES: Dict[str, List[int]] = {}            # date -> game ids
+_COVERED: Dict[str, Tuple[float, bool]] = {}      # date -> (indexed_at, won't change anymore)
+# the warmup thread and range fetches write the index while requests read it
+_INDEX_LOCK = threading.Lock()
+
+_api: Optional[BalldontlieAPI] = None
+
+def get_api() -> BalldontlieAPI:
+    """Build the SDK client on first use instead of at import time."""
+    global _api
+    if _api is None:
+        _api = BalldontlieAPI(api_key=NBA_API_KEY)
+    return _api
 
 def _obj_to_dict(obj: Any) -> Dict[str, Any]:
     """Turn SDK model objects into plain dicts."""
@@ -44,25 +63,69 @@ def _as_games(result: Any) -> List[Dict[str, Any]]:
 def _key_for_dates(dates: List[str]) -> str:
     return ",".join(sorted(dates))
 
+def _settled_before() -> str:
+    # dates before yesterday are done (off days, postponements included); yesterday
+    # gets a day's grace because late games and lagging finals still change it
+    return (datetime.now(ZoneInfo(APP_TIMEZONE)).date() - timedelta(days=1)).isoformat()
+
+def _index_games(dates: Iterable[str], games: List[Dict[str, Any]], now: float):
+    """Record `games` (a full fetch of `dates`) in the team -> game id index."""
+    cutoff = _settled_before()
+    by_date: Dict[str, List[Dict[str, Any]]] = {d: [] for d in dates}
+    for g in games:
+        d = str(g.get("date") or "")[:10]
+        if d in by_date:
+            by_date[d].append(g)
+
+    with _INDEX_LOCK:
+        for d, day in by_date.items():
+            # drop what an earlier fetch of this date put in the index
+            for gid in _DATE_GAMES.pop(d, []):
+                old = _GAMES_BY_ID.pop(gid, {})
+                for side in ("home_team", "visitor_team"):
+                    abbr = (old.get(side) or {}).get("abbreviation")
+                    if abbr:
+                        _TEAM_INDEX.get(abbr, {}).pop(gid, None)
+
+            for g in day:
+                gid = g.get("id")
+                _GAMES_BY_ID[gid] = g
+                for side in ("home_team", "visitor_team"):
+                    abbr = (g.get(side) or {}).get("abbreviation")
+                    if abbr:
+                        _TEAM_INDEX.setdefault(abbr, {})[gid] = d
+            _DATE_GAMES[d] = [g.get("id") for g in day]
+            final = bool(day) and all((g.get("status") or "").lower() == "final" for g in day)
+            _COVERED[d] = (now, final or d < cutoff)
+
+def _is_covered(date_str: str, now: float) -> bool:
+    # a past day or a day of finals never changes; anything else is refreshed like the caches
+    hit = _COVERED.get(date_str)
+    return bool(hit) and (hit[1] or now - hit[0] < CACHE_TTL)
+
 async def fetch_games_for_date(date_str: str) -> List[Dict[str, Any]]:
     now = time.time()
     hit = _CACHE_SINGLE.get(date_str)
     if hit and now - hit[0] < CACHE_TTL:
         return hit[1]
     try:
-        result = api.nba.games.list(dates=[date_str], per_page=100)
+        result = get_api().nba.games.list(dates=[date_str], per_page=100)
         games = _as_games(result)
         _CACHE_SINGLE[date_str] = (now, games)
+        _index_games([date_str], games, now)
         return games
     except Exception as e:
         if hit:
             return hit[1]
         raise HTTPException(status_code=502, detail=str(e))
 
-async def fetch_games_for_dates(dates: List[str]) -> List[Dict[str, Any]]:
+async def fetch_games_for_dates(
+    dates: List[str], stop: Optional[threading.Event] = None,
+) -> List[Dict[str, Any]]:
     """
     Fetch games for multiple dates with small batches to avoid rate limits.
     Uses in-memory cache, retries, and falls back gracefully.
+    If `stop` gets set, returns what it has between batches (without caching it).
     """
     now = time.time()
     key = _key_for_dates(dates)
@@ -77,13 +140,13 @@ async def fetch_games_for_dates(dates: List[str]) -> List[Dict[str, Any]]:
             if wait:
                 time.sleep(wait)
             try:
-                res = api.nba.games.list(dates=batch, per_page=100)
+                res = get_api().nba.games.list(dates=batch, per_page=100)
                 return _as_games(res)
             except Exception:
                 # try again; final exception handled below
                 pass
         # last attempt (raise whatever the SDK throws)
-        res = api.nba.games.list(dates=batch, per_page=100)
+        res = get_api().nba.games.list(dates=batch, per_page=100)
         return _as_games(res)
     # -----------------------------------------------------------------------
 
@@ -92,8 +155,12 @@ async def fetch_games_for_dates(dates: List[str]) -> List[Dict[str, Any]]:
     combined: List[Dict[str, Any]] = []
     try:
         for i in range(0, len(dates), BATCH):
+            if stop is not None and stop.is_set():
+                return combined
             batch = dates[i:i + BATCH]
-            combined.extend(_list_with_retry(batch))
+            games = _list_with_retry(batch)
+            _index_games(batch, games, time.time())
+            combined.extend(games)
             time.sleep(0.25)  # tiny pause between batches
         _CACHE_MULTI[key] = (time.time(), combined)
         return combined
@@ -101,6 +168,8 @@ async def fetch_games_for_dates(dates: List[str]) -> List[Dict[str, Any]]:
         # fallback: day-by-day using the single-date path (already cached)
         combined = []
         for d in dates:
+            if stop is not None and stop.is_set():
+                return combined
             try:
                 combined.extend(await fetch_games_for_date(d))
                 time.sleep(0.2)
@@ -110,4 +179,22 @@ async def fetch_games_for_dates(dates: List[str]) -> List[Dict[str, Any]]:
         _CACHE_MULTI[key] = (time.time(), combined)
         return combined
 
+async def fetch_team_games(team: str, first: date, last: date) -> List[Dict[str, Any]]:
+    """
+    Games for one team between two dates (inclusive), served from the team
+    index. Only dates the index doesn't cover yet go upstream, in the same
+    small batches as fetch_games_for_dates.
+    """
+    now = time.time()
+    start, end = first.isoformat(), last.isoformat()
+    dates = [(first + timedelta(days=i)).isoformat() for i in range((last - first).days + 1)]
+
+    missing = [d for d in dates if not _is_covered(d, now)]
+    if missing:
+        # the SDK calls and batch pauses block, so keep them off the event loop
+        await asyncio.to_thread(lambda: asyncio.run(fetch_games_for_dates(missing)))
 
+    # ISO dates compare correctly as strings
+    with _INDEX_LOCK:
+        ids = [gid for gid, d in _TEAM_INDEX.get(team.upper(), {}).items() if start <= d <= end]
+        return [_GAMES_BY_ID[gid] for gid in ids]
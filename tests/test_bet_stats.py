@@ -0,0 +1,94 @@
+import csv
+import pytest
+from backend.api.routers import bets
+from backend.api.services.bet_stats import BankrollStats
+
+
+@pytest.fixture
+def storage(tmp_path, monkeypatch):
+    monkeypatch.setattr(bets, "DATA_DIR", tmp_path)
+    monkeypatch.setattr(bets, "LEDGER", tmp_path / "ledger.csv")
+    monkeypatch.setattr(bets, "WALLET", tmp_path / "wallet.json")
+    monkeypatch.setattr(bets, "RESULTS_CSV", tmp_path / "results_last_3d.csv")
+    monkeypatch.setattr(bets, "STATS", BankrollStats(tmp_path / "stats.json", tmp_path / "equity.csv", tmp_path / "ledger.csv"))
+    bets.ensure_storage()
+    return tmp_path
+
+
+def _results(rows):
+    with bets.RESULTS_CSV.open("w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["date", "matchup", "status", "winner"])
+        writer.writerows(rows)
+
+
+def test_rebuild_matches_running_stats(storage):
+    # settled out of (date, placed_at) order: the 01-02 games finish first
+    for date, matchup, pick, stake in [
+        ("2025-01-02", "BOS @ LAL", "LAL", 10),
+        ("2025-01-02", "NYK @ MIA", "MIA", 20),
+        ("2025-01-01", "LAL @ BOS", "LAL", 30),
+        ("2025-01-03", "MIA @ NYK", "NYK", 40),
+    ]:
+        bets.place_bet(bets.PlaceBet(date=date, game_id=1, matchup=matchup, pick=pick, stake=stake))
+
+    _results([["2025-01-02", "BOS @ LAL", "Final", "LAL"], ["2025-01-02", "NYK @ MIA", "Final", "MIA"]])
+    assert bets.settle_bets()["settled"] == 2
+    _results([["2025-01-01", "LAL @ BOS", "Final", "BOS"], ["2025-01-03", "MIA @ NYK", "Final", "NYK"]])
+    assert bets.settle_bets()["settled"] == 2
+
+    running = bets.STATS.summary()
+    assert running["longest_win_streak"] == 2
+    assert [p["profit"] for p in running["equity_curve"]] == [10.0, 30.0, 0.0, 40.0]
+
+    assert bets.STATS.rebuild() == running
+    # and a fresh process reading the files back agrees too
+    reloaded = BankrollStats(storage / "stats.json", storage / "equity.csv", storage / "ledger.csv")
+    assert reloaded.summary() == running
+
+
+def test_stats_failure_does_not_undo_settle(storage, monkeypatch):
+    bets.place_bet(bets.PlaceBet(date="2025-01-01", game_id=1, matchup="BOS @ LAL", pick="LAL", stake=10))
+    _results([["2025-01-01", "BOS @ LAL", "Final", "LAL"]])
+
+    def boom(rows):
+        raise OSError("disk full")
+    monkeypatch.setattr(bets.STATS, "record_settled", boom)
+
+    out = bets.settle_bets()
+    assert out["settled"] == 1 and "error" not in out
+    # the failed update was replaced by a resync from the ledger
+    assert bets.STATS.summary()["wins"] == 1
+
+
+def test_rebuild_matches_with_fractional_stakes(storage):
+    for i in range(40):
+        pick, other = ("LAL", "BOS") if i % 3 else ("NYK", "MIA")
+        bets.place_bet(bets.PlaceBet(
+            date="2025-01-01", game_id=i, matchup=f"{other} @ {pick} #{i}", pick=pick, stake=(0.17, 0.27, 1.1)[i % 3],
+        ))
+    rows = bets.read_ledger()
+    for start in range(0, 40, 5):
+        _results([[r["date"], r["matchup"], "Final", r["pick"] if j % 2 else "XXX"]
+                  for j, r in enumerate(rows[start:start + 5], start)])
+        assert bets.settle_bets()["settled"] == 5
+
+    running = bets.STATS.summary()
+    assert bets.STATS.rebuild() == running
+
+
+def _reload(storage) -> BankrollStats:
+    return BankrollStats(storage / "stats.json", storage / "equity.csv", storage / "ledger.csv")
+
+
+def test_stale_or_torn_stats_files_are_rebuilt(storage):
+    bets.place_bet(bets.PlaceBet(date="2025-01-01", game_id=1, matchup="BOS @ LAL", pick="LAL", stake=10))
+    assert _reload(storage).summary()["bets"] == 1
+
+    # a bet that reached the ledger but never made it into the stats (crash or hand edit)
+    with bets.LEDGER.open("a", newline="", encoding="utf-8") as f:
+        csv.writer(f).writerow(["2025-01-01T00:00:00", "bet-x", "2025-01-01", 2, "NYK @ MIA", "MIA", 5.0, "open", "", ""])
+    assert _reload(storage).summary()["bets"] == 2
+
+    (storage / "stats.json").write_text('{"bets": 2, "op')
+    assert _reload(storage).summary()["bets"] == 2
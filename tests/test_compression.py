@@ -0,0 +1,72 @@
+import asyncio
+import threading
+import httpx
+import pytest
+from backend.api import main
+from backend.api.core.responses import ByteCache
+from backend.api.routers import games, results
+
+GAMES = [{
+    "id": i, "date": "2025-01-01", "status": "Final", "period": 4,
+    "home_team": {"abbreviation": "LAL", "full_name": "Los Angeles Lakers"},
+    "visitor_team": {"abbreviation": "BOS", "full_name": "Boston Celtics"},
+    "home_team_score": 100, "visitor_team_score": 90,
+} for i in range(40)]
+
+
+@pytest.fixture
+def client(monkeypatch):
+    async def fake_dates(dates):
+        return GAMES
+
+    async def fake_team(team, first, last):
+        return GAMES
+
+    monkeypatch.setattr(results, "fetch_games_for_dates", fake_dates)
+    monkeypatch.setattr(games, "fetch_team_games", fake_team)
+    results._RESULTS_BYTES.clear()
+    return _get
+
+
+def _get(path: str, accept_encoding: str) -> httpx.Response:
+    async def run():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+            return await c.get(path, headers={"accept-encoding": accept_encoding})
+    return asyncio.run(run())
+
+
+@pytest.mark.parametrize("path", ["/results?days=3", "/games/range?team=LAL&from=2025-01-01&to=2025-01-05"])
+@pytest.mark.parametrize("accept, expected", [
+    ("gzip;q=0", None),
+    ("br;q=1, gzip;q=0", None),
+    ("identity", None),
+    ("gzip", "gzip"),
+    ("deflate, gzip;q=0.5", "gzip"),
+])
+def test_negotiation_through_app(client, path, accept, expected):
+    r = client(path, accept)
+    assert r.status_code == 200
+    assert r.headers.get("content-encoding") == expected
+    assert r.headers.get_list("vary") in ([], ["Accept-Encoding"])
+    if path.startswith("/results"):
+        assert r.headers.get_list("vary") == ["Accept-Encoding"]
+
+
+def test_concurrent_misses_with_maxsize_one():
+    cache = ByteCache(maxsize=1)
+    errors = []
+
+    def miss(i):
+        try:
+            for n in range(200):
+                cache._bodies((i, n), n, lambda: {"i": i})
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=miss, args=(i,)) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == []
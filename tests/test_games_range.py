@@ -0,0 +1,104 @@
+import asyncio
+import time
+import httpx
+import pytest
+from backend.api import main
+from backend.api.services import nba_client
+
+
+class _FakeGames:
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.calls = []
+
+    def list(self, dates, per_page):
+        self.calls.append(list(dates))
+        time.sleep(self.delay)
+        data = []
+        for d in dates:
+            data.append({
+                "id": int(d.replace("-", "")), "date": d, "status": "Final", "period": 4,
+                "home_team": {"abbreviation": "LAL", "full_name": "Los Angeles Lakers"},
+                "visitor_team": {"abbreviation": "BOS", "full_name": "Boston Celtics"},
+                "home_team_score": 100, "visitor_team_score": 90,
+            })
+        return {"data": data}
+
+
+@pytest.fixture
+def fake_api(monkeypatch):
+    def install(delay: float = 0.0) -> _FakeGames:
+        games = _FakeGames(delay)
+        api = type("FakeAPI", (), {"nba": type("FakeNBA", (), {"games": games})})
+        monkeypatch.setattr(nba_client, "_api", api)
+        monkeypatch.setattr(main.app.state, "ready", True, raising=False)
+        for cache in (nba_client._CACHE_SINGLE, nba_client._CACHE_MULTI, nba_client._GAMES_BY_ID,
+                      nba_client._TEAM_INDEX, nba_client._DATE_GAMES, nba_client._COVERED):
+            cache.clear()
+        return games
+    return install
+
+
+def _client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=main.app), base_url="http://test")
+
+
+def test_unpadded_dates_are_normalized(fake_api):
+    games = fake_api()
+
+    async def run():
+        async with _client() as c:
+            await c.get("/games/range", params={"team": "LAL", "from": "2025-01-01", "to": "2025-01-10"})
+            calls = len(games.calls)
+            r = await c.get("/games/range", params={"team": "lal", "from": "2025-1-1", "to": "2025-1-10"})
+            return r.json(), len(games.calls) - calls
+
+    body, new_calls = asyncio.run(run())
+    assert (body["from"], body["to"], body["count"]) == ("2025-01-01", "2025-01-10", 10)
+    assert new_calls == 0
+
+
+def test_upstream_fetch_does_not_block_other_requests(fake_api):
+    fake_api(delay=0.3)
+
+    async def run():
+        async with _client() as c:
+            t = time.perf_counter()
+            slow = asyncio.create_task(
+                c.get("/games/range", params={"team": "LAL", "from": "2025-01-01", "to": "2025-01-09"})
+            )
+            await asyncio.sleep(0.05)
+            health = await c.get("/health")
+            waited = time.perf_counter() - t
+            assert (await slow).json()["count"] == 9
+            return health.status_code, waited
+
+    status, waited = asyncio.run(run())
+    assert status == 200 and waited < 0.3
+
+
+def test_past_dates_stay_covered_even_without_finals(fake_api, monkeypatch):
+    games = fake_api()
+    real_list = games.list
+
+    def off_days(dates, per_page):
+        # 2025-02-14..16: All-Star break, nothing scheduled
+        res = real_list(dates, per_page)
+        res["data"] = [g for g in res["data"] if not "2025-02-14" <= g["date"] <= "2025-02-16"]
+        return res
+    monkeypatch.setattr(games, "list", off_days)
+    monkeypatch.setattr(nba_client.time, "sleep", lambda s: None)  # skip the pauses between batches
+
+    async def run():
+        async with _client() as c:
+            params = {"team": "LAL", "from": "2025-01-01", "to": "2025-03-01"}
+            first = await c.get("/games/range", params=params)
+            calls = len(games.calls)
+            # as if the caches had all expired
+            monkeypatch.setattr(nba_client, "CACHE_TTL", -1)
+            again = await c.get("/games/range", params=params)
+            return first.json(), again.json(), len(games.calls) - calls
+
+    first, again, new_calls = asyncio.run(run())
+    assert first["count"] == again["count"] == 57
+    assert new_calls == 0
@@ -0,0 +1,33 @@
+import threading
+import time
+from backend.api.core.profiling import StackSampler
+
+
+def _parked(ready: threading.Event, release: threading.Event):
+    ready.set()
+    release.wait()
+
+
+def test_sampler_keeps_blocked_waits_but_skips_idle_threads():
+    idle_ready, idle_release = threading.Event(), threading.Event()
+    idle = threading.Thread(target=_parked, args=(idle_ready, idle_release), name="idle")
+    idle.start()
+    idle_ready.wait()
+
+    sampler = StackSampler()
+    sampler.start()
+    # a "request" thread that blocks on an Event while being profiled
+    busy_ready, busy_release = threading.Event(), threading.Event()
+    busy = threading.Thread(target=_parked, args=(busy_ready, busy_release), name="busy")
+    busy.start()
+    time.sleep(0.05)
+    sampler.stop()
+    busy_release.set()
+    idle_release.set()
+    busy.join()
+    idle.join()
+
+    report = sampler.report()
+    assert "_parked" in report and "wait (threading.py" in report
+    # only the thread started under the profiler shows up parked in _parked
+    assert sum(n for stack, n in sampler.stacks.items() if "_parked" in stack) <= sampler.samples
@@ -0,0 +1,18 @@
+from starlette.requests import Request
+from backend.api.core import responses
+
+
+def _request(accept_encoding: str) -> Request:
+    return Request({"type": "http", "headers": [(b"accept-encoding", accept_encoding.encode())]})
+
+
+def test_q_zero_disables_gzip():
+    assert responses._pick_encoding(_request("gzip;q=0")) == ""
+    assert responses._pick_encoding(_request("gzip;q=0, *")) == ""
+
+
+def test_tokens_are_matched_exactly(monkeypatch):
+    monkeypatch.setattr(responses, "brotli", object())
+    assert responses._pick_encoding(_request("xbr, brotli")) == ""
+    assert responses._pick_encoding(_request("gzip, br")) == "br"
+    assert responses._pick_encoding(_request("br;q=0.5, gzip")) == "gzip"